@@ -4,6 +4,7 @@ Client Profile Investment Advisor Agent
 Pure handoff implementation - analyzes client and hands off to portfolio constructor.
 """
 from app.models.client_profile import ClientProfile, ClientSummary
+from utils import astream_structured_response
 from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
@@ -14,9 +15,10 @@ from typing import Literal
 load_dotenv()
 
 gpt_model = ChatOpenAI(
-    model="gpt-5-2025-08-07",
-    reasoning={"effort": "medium"},
-    api_key=os.getenv("OPENAI_API_KEY")
+    model="gpt-4o-mini",
+    api_key=os.getenv("OPENAI_API_KEY"),
+    max_retries=2,
+    timeout=30
 )
 SYSTEM_PROMPT = """
 You are a professional financial advisor specializing in client profile analysis.
@@ -63,22 +65,24 @@ Return a ClientSummary object with the following fields:
 
 
 
-def client_profile_node(state)-> Command[Literal["portfolio_constructor_agent"]]:
+# Built once at import; the node only invokes it
+client_agent = create_agent(
+    model=gpt_model, 
+    tools = [],
+    prompt=SYSTEM_PROMPT, 
+    response_format=ClientSummary,
+    name="client_profile_agent"
+)
+
+async def client_profile_node(state)-> Command[Literal["portfolio_constructor_agent"]]:
     """Node function for LangGraph workflow"""
-    client_agent = create_agent(
-        model=gpt_model, 
-        tools = [],
-        prompt=SYSTEM_PROMPT, 
-        response_format=ClientSummary,
-        name="client_profile_agent"
-    )
     # Get client profile data from state
-    client_data = str(state["client_profile"])
+    client_data = state["client_profile_json"]
     
-    result = client_agent.invoke({"messages": [HumanMessage(content=client_data)]})
+    structured_response = await astream_structured_response(client_agent, [HumanMessage(content=client_data)])
     return Command(
         update={
-            "messages": [HumanMessage(content=str(result["structured_response"]), name="client_profile_agent")],
+            "messages": [HumanMessage(content=str(structured_response), name="client_profile_agent")],
         },
         goto="portfolio_constructor_agent"
     )
@@ -8,14 +8,18 @@ from langgraph.types import Command
 from typing import Literal
 from langgraph.graph import END
 
-from app.models.portfolio_structure import Portfolio
+from app.models.portfolio_structure import Portfolio, PORTFOLIO_ADAPTER
+from utils import astream_structured_response, format_chat_history
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
 llm = ChatOpenAI(
-    model="gpt-5",
-    api_key=openai_api_key
+    model="gpt-4o-mini",
+    api_key=openai_api_key,
+    max_retries=2,
+    timeout=30
 )
+
 SYSTEM_PROMPT = """
 You are a professional portfolio manager. 
 
@@ -37,15 +41,37 @@ Return a Portfolio with:
 - total_allocation: Should be 100.0
 - strategy_summary: Brief explanation of portfolio approach
 """
-def portfolio_construct_node(state) ->Command[Literal["stock_research_agent"]]:
-    portfolio_agent = create_agent(
-        model=llm,
-        prompt=SYSTEM_PROMPT,
-        tools=[],
-        name="portfolio_constructor_agent",
-        response_format=Portfolio
-    )
-    
+
+REFINE_PROMPT = SYSTEM_PROMPT + """
+        
+## REFINEMENT TASK:
+You have received stock research analysis. Based on this research:
+1. Keep assets that got positive recommendations
+2. Replace assets that got negative recommendations with better alternatives
+3. Adjust allocations based on research findings
+4. Create a FINAL optimized portfolio
+
+Ensure the final portfolio allocations add up to 100%.
+        """
+
+# Agents are built once at import; nodes only invoke them
+portfolio_agent = create_agent(
+    model=llm,
+    prompt=SYSTEM_PROMPT,
+    tools=[],
+    name="portfolio_constructor_agent",
+    response_format=Portfolio
+)
+
+refine_agent = create_agent(
+    model=llm,
+    prompt=REFINE_PROMPT,
+    tools=[],
+    name="portfolio_refine_agent",
+    response_format=Portfolio
+)
+
+async def portfolio_construct_node(state) ->Command[Literal["stock_research_agent"]]:
     # Get structured output from previous agent (ClientSummary)
     latest_structured_output = state['messages'][-1].content if state['messages'] else ""
     
@@ -54,7 +80,7 @@ def portfolio_construct_node(state) ->Command[Literal["stock_research_agent"]]:
     # Combine structured data + chat history + client profile
     input_content = f"""
     CLIENT PROFILE:
-    {state['client_profile']}
+    {state['client_profile_json']}
     
     PREVIOUS AGENT OUTPUT (ClientSummary):
     {latest_structured_output}
@@ -62,45 +88,28 @@ def portfolio_construct_node(state) ->Command[Literal["stock_research_agent"]]:
   
     """
     
-    result = portfolio_agent.invoke({"messages": [HumanMessage(content=input_content)]})
+    structured_response = await astream_structured_response(portfolio_agent, [HumanMessage(content=input_content)])
     
     return Command(
         update={
-            "messages": [HumanMessage(content=str(result["structured_response"]), name="portfolio_constructor_agent")]
+            "messages": [HumanMessage(content=PORTFOLIO_ADAPTER.validate_python(structured_response).model_dump_json(), name="portfolio_constructor_agent")]
         },
         goto="stock_research_agent"
     )
 
-def portfolio_refine_node(state):
+async def portfolio_refine_node(state):
     """Second portfolio node that refines based on stock research"""
-    portfolio_agent = create_agent(
-        model=llm,
-        prompt=SYSTEM_PROMPT + """
-        
-## REFINEMENT TASK:
-You have received stock research analysis. Based on this research:
-1. Keep assets that got positive recommendations
-2. Replace assets that got negative recommendations with better alternatives
-3. Adjust allocations based on research findings
-4. Create a FINAL optimized portfolio
-
-Ensure the final portfolio allocations add up to 100%.
-        """,
-        tools=[],
-        name="portfolio_refine_agent",
-        response_format=Portfolio
-    )
-    
     # Get structured output from previous agent (StockReport/Research Analysis)
     latest_structured_output = state['messages'][-1].content if state['messages'] else ""
     
-    # Get full conversation history for context
-    chat_history = "\n".join([f"{msg.name}: {msg.content}" for msg in state['messages']]) if state['messages'] else ""
+    # Get recent conversation history for context; the latest message is
+    # already included above, so only earlier turns are trimmed in
+    chat_history = format_chat_history(state['messages'][:-1])
     
     # Combine structured data + chat history + client profile
     input_content = f"""
     CLIENT PROFILE:
-    {state['client_profile']}
+    {state['client_profile_json']}
     
     PREVIOUS AGENT OUTPUT (Stock Research Analysis):
     {latest_structured_output}
@@ -109,11 +118,11 @@ Ensure the final portfolio allocations add up to 100%.
     {chat_history}
     """
     
-    result = portfolio_agent.invoke({"messages": [HumanMessage(content=input_content)]})
+    structured_response = await astream_structured_response(refine_agent, [HumanMessage(content=input_content)])
     
     return Command(
         update={
-            "messages": [HumanMessage(content=str(result["structured_response"]), name="portfolio_refine_agent")]
+            "messages": [HumanMessage(content=PORTFOLIO_ADAPTER.validate_python(structured_response).model_dump_json(), name="portfolio_refine_agent")]
         },
         goto=END
     )
\ No newline at end of file
@@ -9,16 +9,23 @@ from langchain_core.tools import tool
 from langchain.agents import create_agent
 # YFinance tools imports
 from langchain_community.tools.yahoo_finance_news import YahooFinanceNewsTool
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.types import Command
-import yfinance as yf
+import numpy as np
+import pandas as pd
 
 from app.models.stock_report import StockReport
+from app.tools.yf_cache import STATEMENT_TYPES, get_bulk_history, get_history, get_info, get_statement
+from app.tools.ratios import annualized_volatility, beta
+from utils import astream_structured_response, format_chat_history
 from langgraph.graph import END
 load_dotenv()
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
+# Market proxy used for beta
+BENCHMARK_TICKER = "^GSPC"
+
 SYSTEM_PROMPT = """
 You are a professional stock research analyst with expertise in fundamental analysis and portfolio evaluation.
 
@@ -33,12 +40,12 @@ Conduct comprehensive research on portfolio assets and provide actionable invest
 ## Research Workflow:
 
 ### Step 1: Data Collection
-For EACH ticker in the portfolio, use the available tools to gather:
-- Current stock information (price, market cap, P/E, volume) using `get_stock_info`
-- Historical performance (3-month trend analysis) using `get_stock_history`
-- Financial statements (income statement, balance sheet, cash flow) using `get_financial_statements`
-- **CALCULATED financial ratios** using `calculate_financial_ratios` tool
-- Recent news and market sentiment using `YahooFinanceNewsTool`
+Call `research_portfolio` ONCE with all portfolio tickers comma-separated. It already returns, for every ticker, current stock information (price, market cap, P/E, volume), 3-month price history, annual financial statements and recent news, so do NOT fetch any of these again with other tools.
+In the same turn, call `calculate_financial_ratios` for each ticker (issue these calls together with `research_portfolio`).
+Use the remaining tools ONLY to fill gaps that `research_portfolio` leaves:
+- Other statement types (quarterly, balance sheet, cash flow) using `get_financial_statements`
+- Price history for periods other than 3 months using `get_bulk_stock_history` with all tickers comma-separated (`get_stock_history` for a single ticker)
+- Tickers whose `research_portfolio` section returned an error: `get_stock_info_batch` (`get_stock_info` for a single ticker) and `YahooFinanceNewsTool`
 
 ### Step 2: Fundamental Analysis
 Calculate and analyze key metrics:
@@ -122,27 +129,30 @@ Generate a comprehensive research analysis that includes:
 # YFINANCE TOOLS: Direct Yahoo Finance data access (no external server needed)
 # =============================================================================
 
-@tool
-def get_stock_info(ticker: str) -> str:
-    """Get comprehensive stock information including current price, market cap, and company details."""
-    try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
-        
-        # Get current price safely
-        current_price = info.get('currentPrice') or info.get('regularMarketPrice', 0.0)
-        
-        result = f"""
+def _parse_tickers(tickers: str) -> list[str]:
+    """Split a comma-separated ticker list into unique upper-case symbols"""
+    return list(dict.fromkeys(t.strip().upper() for t in tickers.split(",") if t.strip()))
+
+def format_stock_info(ticker: str, quote: dict, info: dict) -> str:
+    """Render quote fields (preferred from quote, else .info) and company details from .info"""
+    # Get current price safely
+    current_price = quote.get('last_price') or info.get('currentPrice') or info.get('regularMarketPrice', 0.0)
+    market_cap = info.get('marketCap', 0)
+    year_high = info.get('fiftyTwoWeekHigh', 0.0)
+    year_low = info.get('fiftyTwoWeekLow', 0.0)
+    volume = quote.get('last_volume') or info.get('volume', 0)
+    
+    return f"""
         Stock Info for {ticker.upper()}:
         - Current Price: ${current_price}
-        - Market Cap: ${info.get('marketCap', 0):,} 
+        - Market Cap: ${int(market_cap):,} 
         - P/E Ratio: {info.get('trailingPE', 0.0)}
-        - 52 Week High: ${info.get('fiftyTwoWeekHigh', 0.0)}
-        - 52 Week Low: ${info.get('fiftyTwoWeekLow', 0.0)}
+        - 52 Week High: ${year_high}
+        - 52 Week Low: ${year_low}
         - Company: {info.get('longName', 'Unknown')}
         - Sector: {info.get('sector', 'Unknown')}
         - Industry: {info.get('industry', 'Unknown')}
-        - Volume: {info.get('volume', 0):,}
+        - Volume: {int(volume):,}
         - Dividend Yield: {info.get('dividendYield', 0.0)}
         - Beta: {info.get('beta', 0.0)}
         - Book Value: {info.get('bookValue', 0.0)}
@@ -150,82 +160,220 @@ def get_stock_info(ticker: str) -> str:
         - Enterprise Value: {info.get('enterpriseValue', 0)}
         - EBITDA: {info.get('ebitda', 0)}
         """
-        return result
+
+def _get_stock_info(ticker: str) -> str:
+    """Blocking implementation of `get_stock_info`"""
+    try:
+        # .info already carries the quote fields, so one cached payload
+        # serves the whole report
+        return format_stock_info(ticker, {}, get_info(ticker))
     except Exception as e:
         return f"Error getting stock info for {ticker}: {str(e)}"
 
 @tool
-def get_stock_history(ticker: str, period: str) -> str:
-    """Get historical stock price data. Period options: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max. Default period should be '3mo'."""
+async def get_stock_info(ticker: str) -> str:
+    """Get comprehensive stock information including current price, market cap, and company details."""
+    return await asyncio.to_thread(_get_stock_info, ticker)
+
+def format_stock_info_batch(symbols: list[str], infos: list, histories: dict) -> str:
+    """Render get_stock_info output per symbol, taking the latest quote from batched history"""
+    infos = dict(zip(symbols, infos))
+    results = []
+    for symbol in symbols:
+        if isinstance(infos[symbol], Exception):
+            results.append(f"Error getting stock info for {symbol}: {str(infos[symbol])}")
+            continue
+        quote = {}
+        if symbol in histories:
+            last_rows = histories[symbol][['Close', 'Volume']].dropna()
+            if not last_rows.empty:
+                quote = {
+                    'last_price': round(float(last_rows['Close'].iloc[-1]), 2),
+                    'last_volume': int(last_rows['Volume'].iloc[-1])
+                }
+        results.append(format_stock_info(symbol, quote, infos[symbol]))
+    return "\n".join(results)
+
+@tool
+async def get_stock_info_batch(tickers: str) -> str:
+    """Get stock information for several tickers in one call. Pass a comma-separated list (e.g. 'AAPL,MSFT,VOO'). Returns the same fields as get_stock_info for each ticker."""
+    symbols = _parse_tickers(tickers)
+    if not symbols:
+        return "No tickers provided"
+    
+    # One batched download for the latest close and volume, while the
+    # .info payloads load concurrently
+    histories_task = asyncio.to_thread(get_bulk_history, symbols, "5d")
+    info_tasks = [asyncio.to_thread(get_info, symbol) for symbol in symbols]
+    histories, *infos = await asyncio.gather(histories_task, *info_tasks, return_exceptions=True)
+    if isinstance(histories, Exception):
+        return f"Error getting stock info for {tickers}: {str(histories)}"
+    return format_stock_info_batch(symbols, infos, histories)
+
+def format_history(ticker: str, period: str, hist: pd.DataFrame) -> str:
+    """Render the last 10 rows of a price history as a fixed-width table"""
+    # Get last 10 rows for summary
+    recent = hist.tail(10)
+    recent = recent.assign(
+        Date=recent.index.strftime("%Y-%m-%d"),
+        Volume=recent["Volume"].fillna(0).astype("int64")
+    )
+    
+    # Format the whole table in one pass instead of row-by-row iterrows()
+    price = "${:.2f}".format
+    table = recent[["Date", "Open", "High", "Low", "Close", "Volume"]].to_string(
+        index=False,
+        formatters={
+            "Open": price,
+            "High": price,
+            "Low": price,
+            "Close": price,
+            "Volume": "{:,}".format
+        }
+    )
+    return f"Historical prices for {ticker.upper()} (last 10 days from {period} period):\n{table}\n"
+
+def _get_stock_history(ticker: str, period: str) -> str:
+    """Blocking implementation of `get_stock_history`"""
+    # Use default if period is not provided or empty
+    if not period or period.strip() == "":
+        period = "3mo"
     try:
-        stock = yf.Ticker(ticker.upper())
-        # Use default if period is not provided or empty
-        if not period or period.strip() == "":
-            period = "3mo"
-        hist = stock.history(period=period)
+        hist = get_history(ticker, period)
         
         if hist.empty:
             return f"No historical data found for {ticker}"
         
-        # Get last 10 rows for summary
-        recent = hist.tail(10)
-        result = f"Historical prices for {ticker.upper()} (last 10 days from {period} period):\n"
-        result += "Date\t\tOpen\tHigh\tLow\tClose\tVolume\n"
-        result += "-" * 60 + "\n"
-        
-        for date, row in recent.iterrows():
-            result += f"{date.strftime('%Y-%m-%d')}\t${row['Open']:.2f}\t${row['High']:.2f}\t${row['Low']:.2f}\t${row['Close']:.2f}\t{int(row['Volume']):,}\n"
-        
-        return result
+        return format_history(ticker, period, hist)
     except Exception as e:
         return f"Error getting historical data for {ticker}: {str(e)}"
 
 @tool
-def get_financial_statements(ticker: str, statement_type: str) -> str:
-    """Get financial statements. Types: financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow. Default should be 'financials'."""
+async def get_stock_history(ticker: str, period: str) -> str:
+    """Get historical stock price data. Period options: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max. Default period should be '3mo'."""
+    return await asyncio.to_thread(_get_stock_history, ticker, period)
+
+def _get_bulk_stock_history(tickers: str, period: str = "3mo") -> str:
+    """Blocking implementation of `get_bulk_stock_history`"""
+    if not period or period.strip() == "":
+        period = "3mo"
+    symbols = _parse_tickers(tickers)
+    if not symbols:
+        return "No tickers provided"
+    
     try:
-        stock = yf.Ticker(ticker.upper())
-        
-        # Use default if statement_type is not provided or empty
-        if not statement_type or statement_type.strip() == "":
-            statement_type = "financials"
-        
-        if statement_type == "financials":
-            data = stock.financials
-        elif statement_type == "quarterly_financials":
-            data = stock.quarterly_financials
-        elif statement_type == "balance_sheet":
-            data = stock.balance_sheet
-        elif statement_type == "quarterly_balance_sheet":
-            data = stock.quarterly_balance_sheet
-        elif statement_type == "cashflow":
-            data = stock.cashflow
-        elif statement_type == "quarterly_cashflow":
-            data = stock.quarterly_cashflow
-        else:
+        histories = get_bulk_history(symbols, period)
+    except Exception as e:
+        return f"Error getting historical data for {tickers}: {str(e)}"
+    
+    return "\n".join(
+        format_history(symbol, period, histories[symbol]) if symbol in histories
+        else f"No historical data found for {symbol}"
+        for symbol in symbols
+    )
+
+@tool
+async def get_bulk_stock_history(tickers: str, period: str = "3mo") -> str:
+    """Get historical stock price data for several tickers in one request. Pass a comma-separated list (e.g. 'AAPL,MSFT,VOO'). Period options match get_stock_history. Default period should be '3mo'."""
+    return await asyncio.to_thread(_get_bulk_stock_history, tickers, period)
+
+# Line items worth sending to the LLM for each statement family
+KEY_STATEMENT_ROWS = {
+    "financials": [
+        "Total Revenue", "Gross Profit", "Operating Income", "EBITDA", "Net Income", "Diluted EPS"
+    ],
+    "balance_sheet": [
+        "Total Assets", "Total Liabilities Net Minority Interest", "Stockholders Equity",
+        "Total Debt", "Cash And Cash Equivalents", "Current Assets", "Current Liabilities"
+    ],
+    "cashflow": [
+        "Operating Cash Flow", "Capital Expenditure", "Free Cash Flow",
+        "Cash Dividends Paid", "Repurchase Of Capital Stock"
+    ]
+}
+
+def _get_financial_statements(ticker: str, statement_type: str) -> str:
+    """Blocking implementation of `get_financial_statements`"""
+    # Use default if statement_type is not provided or empty
+    statement_type = (statement_type or "").strip() or "financials"
+    try:
+        if statement_type not in STATEMENT_TYPES:
             return f"Invalid statement type: {statement_type}"
+        data = get_statement(ticker, statement_type)
         
         if data.empty:
             return f"No {statement_type} data found for {ticker}"
         
-        # Return key metrics summary
-        result = f"{statement_type.title()} for {ticker.upper()}:\n"
-        result += str(data.head(10))  # Show first 10 rows
+        # Return key metrics summary, falling back to the first 10 rows
+        key_rows = [row for row in KEY_STATEMENT_ROWS[statement_type.removeprefix("quarterly_")] if row in data.index]
+        summary = data.loc[key_rows] if key_rows else data.head(10)
+        summary = summary.rename(columns=lambda col: col.strftime("%Y-%m-%d") if hasattr(col, "strftime") else col)
+        result = "".join([
+            f"{statement_type.title()} for {ticker.upper()}:\n",
+            summary.to_csv()
+        ])
         return result
     except Exception as e:
         return f"Error getting {statement_type} for {ticker}: {str(e)}"
 
 @tool
-def calculate_financial_ratios(ticker: str) -> str:
-    """Calculate key financial ratios for a stock using available financial data."""
+async def get_financial_statements(ticker: str, statement_type: str) -> str:
+    """Get financial statements. Types: financials, quarterly_financials, balance_sheet, quarterly_balance_sheet, cashflow, quarterly_cashflow. Default should be 'financials'."""
+    return await asyncio.to_thread(_get_financial_statements, ticker, statement_type)
+
+news_tool = YahooFinanceNewsTool()  # This is from langchain_community
+
+def _get_news(ticker: str) -> str:
+    """Blocking wrapper around the Yahoo Finance news tool"""
+    try:
+        return f"Recent news for {ticker.upper()}:\n{news_tool.run(ticker.upper())}"
+    except Exception as e:
+        return f"Error getting news for {ticker}: {str(e)}"
+
+async def research_ticker(ticker: str) -> str:
+    """Fetch info, history, statements and news for one ticker concurrently"""
+    sections = await asyncio.gather(
+        asyncio.to_thread(_get_stock_info, ticker),
+        asyncio.to_thread(_get_stock_history, ticker, "3mo"),
+        asyncio.to_thread(_get_financial_statements, ticker, "financials"),
+        asyncio.to_thread(_get_news, ticker)
+    )
+    return "\n".join(sections)
+
+@tool
+async def research_portfolio(tickers: str) -> str:
+    """Research several tickers at once: stock info, 3-month history, annual financials and recent news for each. Pass a comma-separated list (e.g. 'AAPL,MSFT,VOO')."""
+    symbols = _parse_tickers(tickers)
+    if not symbols:
+        return "No tickers provided"
+    # One batched download fills the 3-month history cache for every ticker, so
+    # the per-ticker history reads below are cache hits instead of one
+    # Ticker.history request each; symbols it missed fall back to those reads
+    await asyncio.to_thread(get_bulk_history, symbols, "3mo")
+    reports = await asyncio.gather(*[research_ticker(symbol) for symbol in symbols])
+    return ("\n" + "=" * 60 + "\n").join(reports)
+
+# Statement line items to try, in order, for each figure; Yahoo's naming
+# differs between companies and API versions
+NET_INCOME_KEYS = ('Net Income', 'Net Income Common Stockholders', 'Net Income Applicable To Common Shares')
+EQUITY_KEYS = ('Stockholders Equity', 'Total Stockholder Equity', 'Shareholders Equity', 'Total Equity')
+TOTAL_DEBT_KEYS = ('Total Debt', 'Long Term Debt', 'Net Debt', 'Total Liabilities')
+CURRENT_ASSETS_KEYS = ('Current Assets', 'Total Current Assets')
+CURRENT_LIABILITIES_KEYS = ('Current Liabilities', 'Total Current Liabilities')
+
+def _first(items: dict, *keys: str, default: float = 0):
+    """First non-zero value among keys in a dropna'd statement column"""
+    return next((value for key in keys if (value := items.get(key))), default)
+
+def _calculate_financial_ratios(
+    ticker: str,
+    info: dict,
+    financials: pd.DataFrame,
+    balance_sheet: pd.DataFrame,
+    history: pd.DataFrame
+) -> str:
+    """Blocking ratio calculation over already-fetched data for `calculate_financial_ratios`"""
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
-        
-        # Get financial statements
-        financials = stock.financials
-        balance_sheet = stock.balance_sheet
-        
         # Initialize ratios with defaults
         ratios = {
             'pe_ratio': 0.0,
@@ -235,17 +383,33 @@ def calculate_financial_ratios(ticker: str) -> str:
             'price_to_book': 0.0,
             'current_ratio': 0.0,
             'gross_margin': 0.0,
-            'operating_margin': 0.0
+            'operating_margin': 0.0,
+            'peg_ratio': 0.0,
+            'volatility': 0.0,
+            'beta': 0.0
         }
         
+        # Latest reporting period of each statement as a plain dict, extracted
+        # once; dict lookups are far cheaper than Series label lookups
+        latest_financials = {} if financials.empty else financials.iloc[:, 0].dropna().to_dict()
+        latest_balance = {} if balance_sheet.empty else balance_sheet.iloc[:, 0].dropna().to_dict()
+        shareholders_equity = _first(latest_balance, *EQUITY_KEYS)
+        
+        # .info inputs shared by the manual fallbacks below, read once
+        current_price = info.get('currentPrice') or info.get('regularMarketPrice')
+        eps = info.get('trailingEps') or info.get('forwardEps')
+        book_value = info.get('bookValue')
+        shares_outstanding = info.get('sharesOutstanding') or 0
+        market_cap = info.get('marketCap') or 0
+        info_total_debt = info.get('totalDebt') or 0
+        cash = info.get('totalCash') or 0
+        
         # Calculate P/E Ratio - try multiple methods
         pe = info.get('trailingPE') or info.get('forwardPE')
         if pe and pe > 0:
             ratios['pe_ratio'] = round(pe, 2)
         else:
             # Manual P/E calculation: Current Price / EPS
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            eps = info.get('trailingEps') or info.get('forwardEps')
             if current_price and eps and eps > 0:
                 ratios['pe_ratio'] = round(current_price / eps, 2)
         
@@ -256,16 +420,12 @@ def calculate_financial_ratios(ticker: str) -> str:
             ratios['ev_ebitda'] = round(ev / ebitda, 2)
         else:
             # Manual EV/EBITDA calculation from financial statements
-            market_cap = info.get('marketCap', 0)
-            total_debt = info.get('totalDebt', 0)
-            cash = info.get('totalCash', 0)
             if market_cap and not financials.empty:
                 try:
-                    latest_financials = financials.iloc[:, 0]
-                    operating_income = latest_financials.get('Operating Income', 0)
-                    depreciation = latest_financials.get('Depreciation', 0) or 0
+                    operating_income = _first(latest_financials, 'Operating Income')
+                    depreciation = _first(latest_financials, 'Depreciation')
                     ebitda_calc = operating_income + depreciation
-                    ev_calc = market_cap + total_debt - cash
+                    ev_calc = market_cap + info_total_debt - cash
                     if ebitda_calc > 0 and ev_calc > 0:
                         ratios['ev_ebitda'] = round(ev_calc / ebitda_calc, 2)
                 except:
@@ -278,21 +438,8 @@ def calculate_financial_ratios(ticker: str) -> str:
         elif not financials.empty and not balance_sheet.empty:
             try:
                 # Manual ROE calculation from financial statements
-                latest_financials = financials.iloc[:, 0]
-                latest_balance = balance_sheet.iloc[:, 0]
-                
-                # Try multiple field names for net income
-                net_income = (latest_financials.get('Net Income') or 
-                            latest_financials.get('Net Income Common Stockholders') or 
-                            latest_financials.get('Net Income Applicable To Common Shares', 0))
-                
-                # Try multiple field names for shareholders equity
-                shareholders_equity = (latest_balance.get('Stockholders Equity') or 
-                                     latest_balance.get('Total Stockholder Equity') or
-                                     latest_balance.get('Shareholders Equity') or
-                                     latest_balance.get('Total Equity', 0))
-                
-                if net_income and shareholders_equity and shareholders_equity > 0:
+                net_income = _first(latest_financials, *NET_INCOME_KEYS)
+                if net_income and shareholders_equity > 0:
                     ratios['roe'] = round((net_income / shareholders_equity) * 100, 2)
             except:
                 pass
@@ -300,21 +447,8 @@ def calculate_financial_ratios(ticker: str) -> str:
         # Calculate Debt-to-Equity - try multiple methods
         if not balance_sheet.empty:
             try:
-                latest_balance = balance_sheet.iloc[:, 0]
-                
-                # Try multiple field names for total debt
-                total_debt = (latest_balance.get('Total Debt') or 
-                            latest_balance.get('Long Term Debt') or
-                            latest_balance.get('Net Debt') or
-                            latest_balance.get('Total Liabilities', 0))
-                
-                # Try multiple field names for shareholders equity
-                shareholders_equity = (latest_balance.get('Stockholders Equity') or 
-                                     latest_balance.get('Total Stockholder Equity') or
-                                     latest_balance.get('Shareholders Equity') or
-                                     latest_balance.get('Total Equity', 0))
-                
-                if total_debt and shareholders_equity and shareholders_equity > 0:
+                total_debt = _first(latest_balance, *TOTAL_DEBT_KEYS)
+                if total_debt and shareholders_equity > 0:
                     ratios['debt_to_equity'] = round(total_debt / shareholders_equity, 2)
             except Exception as calc_error:
                 print(f"Error in debt-to-equity calculations: {calc_error}")
@@ -322,16 +456,16 @@ def calculate_financial_ratios(ticker: str) -> str:
         # Calculate margins from financial statements
         if not financials.empty:
             try:
-                latest_financials = financials.iloc[:, 0]
-                revenue = latest_financials.get('Total Revenue', 0)
-                gross_profit = latest_financials.get('Gross Profit', 0)
-                operating_income = latest_financials.get('Operating Income', 0)
+                revenue = _first(latest_financials, 'Total Revenue')
+                gross_profit = _first(latest_financials, 'Gross Profit')
+                operating_income = _first(latest_financials, 'Operating Income')
                 
                 if revenue and revenue > 0:
+                    percent_of_revenue = 100.0 / revenue
                     if gross_profit:
-                        ratios['gross_margin'] = round((gross_profit / revenue) * 100, 2)
+                        ratios['gross_margin'] = round(gross_profit * percent_of_revenue, 2)
                     if operating_income:
-                        ratios['operating_margin'] = round((operating_income / revenue) * 100, 2)
+                        ratios['operating_margin'] = round(operating_income * percent_of_revenue, 2)
             except Exception as calc_error:
                 print(f"Error in margin calculations: {calc_error}")
         
@@ -341,19 +475,12 @@ def calculate_financial_ratios(ticker: str) -> str:
             ratios['price_to_book'] = round(pb_ratio, 2)
         else:
             # Manual P/B calculation: Market Price / Book Value per Share
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            book_value = info.get('bookValue')
             if current_price and book_value and book_value > 0:
                 ratios['price_to_book'] = round(current_price / book_value, 2)
             elif current_price and not balance_sheet.empty:
                 try:
                     # Calculate book value per share from balance sheet
-                    latest_balance = balance_sheet.iloc[:, 0]
-                    shareholders_equity = (latest_balance.get('Stockholders Equity') or 
-                                         latest_balance.get('Total Stockholder Equity') or
-                                         latest_balance.get('Total Equity', 0))
-                    shares_outstanding = info.get('sharesOutstanding', 0)
-                    if shareholders_equity and shares_outstanding and shares_outstanding > 0:
+                    if shareholders_equity > 0 and shares_outstanding > 0:
                         book_value_per_share = shareholders_equity / shares_outstanding
                         ratios['price_to_book'] = round(current_price / book_value_per_share, 2)
                 except:
@@ -366,16 +493,39 @@ def calculate_financial_ratios(ticker: str) -> str:
         elif not balance_sheet.empty:
             try:
                 # Manual Current Ratio calculation: Current Assets / Current Liabilities
-                latest_balance = balance_sheet.iloc[:, 0]
-                current_assets = (latest_balance.get('Current Assets') or 
-                                latest_balance.get('Total Current Assets', 0))
-                current_liabilities = (latest_balance.get('Current Liabilities') or 
-                                     latest_balance.get('Total Current Liabilities', 0))
-                if current_assets and current_liabilities and current_liabilities > 0:
+                current_assets = _first(latest_balance, *CURRENT_ASSETS_KEYS)
+                current_liabilities = _first(latest_balance, *CURRENT_LIABILITIES_KEYS)
+                if current_assets and current_liabilities > 0:
                     ratios['current_ratio'] = round(current_assets / current_liabilities, 2)
             except:
                 pass
         
+        # PEG Ratio as reported by Yahoo
+        peg_ratio = info.get('trailingPegRatio') or info.get('pegRatio')
+        if peg_ratio and peg_ratio > 0:
+            ratios['peg_ratio'] = round(peg_ratio, 2)
+        
+        # Volatility and Beta from one year of daily closes
+        try:
+            close = history['Close'].dropna()
+            ratios['volatility'] = round(annualized_volatility(close.to_numpy(np.float64)), 2)
+            
+            beta_from_info = info.get('beta')
+            if beta_from_info:
+                ratios['beta'] = round(beta_from_info, 2)
+            else:
+                benchmark = get_history(BENCHMARK_TICKER, "1y")['Close'].dropna()
+                # Align on calendar date; exchanges report different timezones
+                close.index = close.index.tz_localize(None).normalize()
+                benchmark.index = benchmark.index.tz_localize(None).normalize()
+                aligned = pd.concat([close, benchmark], axis=1, join="inner")
+                ratios['beta'] = round(beta(
+                    aligned.iloc[:, 0].to_numpy(np.float64),
+                    aligned.iloc[:, 1].to_numpy(np.float64)
+                ), 2)
+        except Exception as calc_error:
+            print(f"Error in volatility/beta calculations: {calc_error}")
+        
         result = f"""
         Calculated Financial Ratios for {ticker.upper()}:
         - P/E Ratio: {ratios['pe_ratio']}
@@ -386,6 +536,9 @@ def calculate_financial_ratios(ticker: str) -> str:
         - Current Ratio: {ratios['current_ratio']}
         - Gross Margin: {ratios['gross_margin']}%
         - Operating Margin: {ratios['operating_margin']}%
+        - PEG Ratio: {ratios['peg_ratio']}
+        - Volatility (annualized): {ratios['volatility']}%
+        - Beta: {ratios['beta']}
         
         Note: All ratios calculated from available data. Zero values indicate data not available or not applicable.
         """
@@ -394,47 +547,69 @@ def calculate_financial_ratios(ticker: str) -> str:
     except Exception as e:
         return f"Error calculating ratios for {ticker}: {str(e)}"
 
+
+@tool
+async def calculate_financial_ratios(ticker: str) -> str:
+    """Calculate key financial ratios for a stock using available financial data."""
+    try:
+        # Fetch the independent endpoints concurrently; cache hits return immediately
+        info, financials, balance_sheet, history = await asyncio.gather(
+            asyncio.to_thread(get_info, ticker),
+            asyncio.to_thread(get_statement, ticker, "financials"),
+            asyncio.to_thread(get_statement, ticker, "balance_sheet"),
+            asyncio.to_thread(get_history, ticker, "1y")
+        )
+    except Exception as e:
+        return f"Error calculating ratios for {ticker}: {str(e)}"
+    return await asyncio.to_thread(_calculate_financial_ratios, ticker, info, financials, balance_sheet, history)
+
 # Create YFinance tools list
 def create_yfinance_tools():
     """Create a list of YFinance tools for the agent"""
     return [
         get_stock_info,
+        get_stock_info_batch,
         get_stock_history,
+        get_bulk_stock_history,
         get_financial_statements,
         calculate_financial_ratios,  # New dedicated ratio calculation tool
-        YahooFinanceNewsTool()  # This is from langchain_community
+        research_portfolio,
+        news_tool
     ]
 
-    
-def stock_research_node(state):
+# Byte-identical system message on every call so OpenAI's prompt cache can
+# serve the prefix instead of re-processing it
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+# Create the language model
+llm = ChatOpenAI(
+    model="gpt-4.1",  # Fixed model name
+    api_key=openai_api_key,
+    extra_body={"prompt_cache_key": "stock_research_v1"}
+)
+
+# Create the research agent with structured output once at import
+stock_agent = create_agent(
+    model=llm, 
+    prompt=SYSTEM_MESSAGE, 
+    tools=create_yfinance_tools(), 
+    name="stock_research_agent",
+    response_format=StockReport
+)
+
+async def stock_research_node(state):
     """Stock research node function for LangGraph workflow"""
-    lc_tools = create_yfinance_tools()
-    
-    # Create the language model
-    llm = ChatOpenAI(
-        model="gpt-4.1",  # Fixed model name
-        api_key=openai_api_key
-    )
-    
-    # Create the research agent with structured output
-    stock_agent = create_agent(
-        model=llm, 
-        prompt=SYSTEM_PROMPT, 
-        tools=lc_tools, 
-        name="stock_research_agent",
-        response_format=StockReport
-    )
-    
     # Get structured output from previous agent (Portfolio)
     latest_structured_output = state['messages'][-1].content if state['messages'] else ""
     
-    # Get full conversation history for context
-    chat_history = "\n".join([f"{msg.name}: {msg.content}" for msg in state['messages']]) if state['messages'] else ""
+    # Get recent conversation history for context; the latest message is
+    # already included above, so only earlier turns are trimmed in
+    chat_history = format_chat_history(state['messages'][:-1])
     
     # Combine structured data + chat history + client profile
     input_content = f"""
     CLIENT PROFILE:
-    {state['client_profile']}
+    {state['client_profile_json']}
     
     PREVIOUS AGENT OUTPUT (Portfolio):
     {latest_structured_output}
@@ -443,11 +618,11 @@ def stock_research_node(state):
     {chat_history}
     """
     
-    result = stock_agent.invoke({"messages": [HumanMessage(content=input_content)]})
+    structured_response = await astream_structured_response(stock_agent, [HumanMessage(content=input_content)])
     
     return Command(
         update={
-            "messages": [HumanMessage(content=str(result["structured_response"]), name="stock_research_agent")]
+            "messages": [HumanMessage(content=str(structured_response), name="stock_research_agent")]
         },
         goto="portfolio_refine_agent"
     )
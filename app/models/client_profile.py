@@ -1,16 +1,26 @@
 from datetime import date, timedelta
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
+
+def _default_end_date() -> date:
+    """Thirty years from today, evaluated per instance rather than once at import"""
+    today = date.today()
+    try:
+        return today.replace(year=today.year + 30)
+    except ValueError:  # Feb 29 in a non-leap target year
+        return today.replace(year=today.year + 30, day=28)
+
 class ClientProfile(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     risk_tolerance: int = Field(ge=1, le=10, description="Risk tolerance on scale 1-10 (1=very conservative, 10=very aggressive)")
     investment_goals: str = Field(description="Client's investment objectives and goals")
     cash_flow: int = Field(gt=0, description="Available investment capital (must be positive)")
     start_date: date = Field(description="Investment start date")
-    end_date: date = Field(description="Investment end date", default = date.today().replace(year=date.today().year + 30) )
+    end_date: date = Field(description="Investment end date", default_factory=_default_end_date)
     
 ### Output Format
 class ClientSummary(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     recommended_portfolio_type: str = Field(description="Recommended portfolio type")
     expected_yearly_returns: float = Field(description="Expected yearly returns")
     risk_level: str = Field(description="Risk level")
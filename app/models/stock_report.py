@@ -3,10 +3,12 @@ from pydantic import BaseModel, Field, ConfigDict
 
 
 class KeyPoint(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     point: str = Field(..., description="Concise key investment thesis point")
 
 
 class FinancialStatement(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     year: int = Field(..., description="Fiscal year")
     revenue: float = Field(..., description="Revenue in billions USD")
@@ -16,7 +18,8 @@ class FinancialStatement(BaseModel):
     free_cash_flow: float = 0.0
 
 
-class RatioAnalysis(BaseModel):    
+class RatioAnalysis(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     pe_ratio: float = Field(0.0, ge=0, description="Price-to-Earnings ratio, use 0.0 if not available")
     ev_ebitda: float = Field(0.0, description="Enterprise Value to EBITDA ratio, use 0.0 if not available")
     roe: float = Field(0.0, description="Return on Equity percentage, use 0.0 if not available")
@@ -24,6 +27,7 @@ class RatioAnalysis(BaseModel):
 
 
 class Valuation(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     method: str = Field(..., description="e.g., DCF, Comparables")
     target_price: float = Field(1.0, ge=0.01)
@@ -33,19 +37,20 @@ class Valuation(BaseModel):
 
 
 class Risk(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     category: str = Field(..., description="Market, Company-specific, or Industry")
     description: str
 
 
 class ReportSection(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
     title: str
     content: str
 
 
 class StockReport(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
     
     # Cover page / metadata
     company_name: str
@@ -0,0 +1,148 @@
+"""
+File-backed TTL cache for Yahoo Finance lookups.
+
+Each entry is a pickle at {cache_dir}/{ticker}/{endpoint}-{params_md5}.pkl
+with a JSON sidecar recording when it was fetched and how long it stays
+fresh, so repeated research on the same ticker is served from disk instead
+of re-hitting Yahoo.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.getenv("BULLIE_CACHE_DIR", ".cache"))
+
+# Entries kept in process memory in front of the disk cache; bounded so a
+# long run over many tickers does not hold every DataFrame alive
+MEMORY_CACHE_SIZE = 128
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return not value
+    # DataFrame / Series
+    return getattr(value, "empty", False) is True
+
+
+class FileCache:
+    """Pickle-on-disk cache keyed by (ticker, endpoint, params) with a per-entry TTL."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, memory_size: int = MEMORY_CACHE_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.memory_size = memory_size
+        self._memory: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per key held across fetch(), so concurrent misses on the
+        # same key (parallel tool calls for one ticker) fetch it only once
+        self._key_locks: dict[tuple, threading.Lock] = {}
+
+    def _remember(self, key: tuple, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        # Unique temp file per write, so concurrent misses on one key never
+        # interleave into the same file before os.replace publishes it
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _paths(self, ticker: str, endpoint: str, params: str) -> tuple[Path, Path]:
+        params_md5 = hashlib.md5(f"{ticker}:{params}".encode()).hexdigest()
+        base = self.cache_dir / ticker / f"{endpoint}-{params_md5}"
+        return base.with_suffix(".pkl"), base.with_suffix(".json")
+
+    def get(self, ticker: str, endpoint: str, params: str = "") -> Optional[Any]:
+        """Return the cached value, or None if missing, unreadable or past its TTL."""
+        key = (ticker, endpoint, params)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._memory.move_to_end(key)
+                logger.debug("memory cache hit: %s %s %s", ticker, endpoint, params)
+                return entry[1]
+
+        data_path, meta_path = self._paths(ticker, endpoint, params)
+        try:
+            with open(meta_path, "r") as file:
+                meta = json.load(file)
+            if time.time() - meta["fetched_at"] > meta["ttl"]:
+                logger.debug("cache expired: %s %s %s", ticker, endpoint, params)
+                return None
+            with open(data_path, "rb") as file:
+                value = pickle.load(file)
+        except Exception as e:
+            # Missing, corrupt or written by an incompatible library version:
+            # all just mean the value has to be fetched again
+            logger.debug("cache miss: %s %s %s (%s)", ticker, endpoint, params, e)
+            return None
+
+        logger.debug("cache hit: %s %s %s", ticker, endpoint, params)
+        self._remember(key, meta["fetched_at"] + meta["ttl"], value)
+        return value
+
+    def set(self, ticker: str, endpoint: str, params: str, value: Any, ttl: float) -> None:
+        """Store value in memory and on disk; disk failures are logged and otherwise ignored."""
+        self._remember((ticker, endpoint, params), time.time() + ttl, value)
+        data_path, meta_path = self._paths(ticker, endpoint, params)
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(data_path, pickle.dumps(value))
+            # Sidecar goes last so a reader never sees fresh metadata for a stale payload
+            self._write_atomic(meta_path, json.dumps({"fetched_at": time.time(), "ttl": ttl}).encode())
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning("cache write failed for %s: %s", data_path, e)
+
+    def get_or_set(
+        self,
+        ticker: str,
+        endpoint: str,
+        params: str,
+        ttl: float,
+        fetch: Callable[[], Any],
+        force_refresh: bool = False
+    ) -> Any:
+        """Return the cached value, calling fetch() and storing its result on a miss.
+
+        Empty results are returned but not stored: yfinance answers failures and
+        rate limits with an empty frame or dict rather than raising.
+        """
+        if not force_refresh:
+            value = self.get(ticker, endpoint, params)
+            if value is not None:
+                return value
+        with self._key_lock((ticker, endpoint, params)):
+            # Another thread may have filled the key while this one waited
+            if not force_refresh:
+                value = self.get(ticker, endpoint, params)
+                if value is not None:
+                    return value
+            value = fetch()
+            if not _is_empty(value):
+                self.set(ticker, endpoint, params, value, ttl)
+            return value
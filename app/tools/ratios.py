@@ -0,0 +1,33 @@
+"""
+Vectorized price-based risk metrics used by the ratio calculation tool.
+
+Callers pass plain float64 arrays (e.g. hist['Close'].to_numpy(np.float64))
+so the math runs in NumPy without pandas overhead.
+"""
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def daily_returns(close: np.ndarray) -> np.ndarray:
+    """Simple day-over-day returns of a price series"""
+    return close[1:] / close[:-1] - 1.0
+
+
+def annualized_volatility(close: np.ndarray) -> float:
+    """Annualized volatility of daily returns as a percentage; 0.0 if there is too little data"""
+    if close.size < 3:
+        return 0.0
+    return float(daily_returns(close).std(ddof=1) * np.sqrt(TRADING_DAYS) * 100)
+
+
+def beta(close: np.ndarray, benchmark_close: np.ndarray) -> float:
+    """Beta of close against benchmark_close (same dates, same length); 0.0 if undefined"""
+    if close.size < 3 or close.size != benchmark_close.size:
+        return 0.0
+    returns = daily_returns(close)
+    benchmark_returns = daily_returns(benchmark_close)
+    benchmark_var = benchmark_returns.var(ddof=1)
+    if benchmark_var == 0:
+        return 0.0
+    return float(np.cov(returns, benchmark_returns, ddof=1)[0, 1] / benchmark_var)
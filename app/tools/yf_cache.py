@@ -0,0 +1,143 @@
+"""
+Cached Yahoo Finance data access.
+
+All yfinance traffic from the agents goes through these helpers, which return
+raw payloads (dicts and DataFrames) from the on-disk cache when fresh and hit
+Yahoo only on a miss or when force_refresh is set.
+"""
+import logging
+import re
+from operator import attrgetter
+
+import pandas as pd
+import yfinance as yf
+
+from app.tools.cache import CACHE_DIR, FileCache
+
+logger = logging.getLogger(__name__)
+
+# TTLs in seconds: info and prices move intraday, statements only change
+# quarterly
+INFO_TTL = 60 * 60
+HISTORY_TTL = 60 * 60
+STATEMENT_TTL = 24 * 60 * 60
+
+# statement_type -> Ticker property; adding a statement is one entry here
+STATEMENT_GETTERS = {
+    "financials": attrgetter("financials"),
+    "quarterly_financials": attrgetter("quarterly_financials"),
+    "balance_sheet": attrgetter("balance_sheet"),
+    "quarterly_balance_sheet": attrgetter("quarterly_balance_sheet"),
+    "cashflow": attrgetter("cashflow"),
+    "quarterly_cashflow": attrgetter("quarterly_cashflow")
+}
+STATEMENT_TYPES = tuple(STATEMENT_GETTERS)
+
+# Yahoo symbols such as AAPL, BRK-B, ^GSPC or EURUSD=X. Symbols come from
+# the LLM and become cache directory names, so anything else (e.g. path
+# separators or a bare "..") is rejected before it reaches the filesystem
+SYMBOL_PATTERN = re.compile(r"[A-Z0-9^][A-Z0-9.^=-]{0,14}")
+
+# Yahoo's download endpoint accepts up to ~20 symbols per request
+BULK_CHUNK_SIZE = 20
+
+cache = FileCache(CACHE_DIR / "yfinance")
+
+# One pooled, keep-alive HTTP session shared by every yfinance call so TLS
+# handshakes are paid once per host instead of once per Ticker. Newer
+# yfinance releases require a curl_cffi session; older ones take requests.
+try:
+    from curl_cffi import requests as curl_requests
+    yf_session = curl_requests.Session(impersonate="chrome")
+except ImportError:
+    import requests
+    from requests.adapters import HTTPAdapter
+    yf_session = requests.Session()
+    yf_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50))
+
+
+def _symbol(ticker: str) -> str:
+    """Normalize a ticker to upper case, raising ValueError if it is not a valid symbol"""
+    symbol = ticker.strip().upper()
+    if not SYMBOL_PATTERN.fullmatch(symbol):
+        raise ValueError(f"Invalid ticker symbol: {ticker!r}")
+    return symbol
+
+
+def _stock(symbol: str) -> yf.Ticker:
+    # A fresh Ticker per fetch: yfinance memoizes fetched data on the instance,
+    # so a reused one would hand expired payloads back to the cache as new.
+    # Fetches only run on a cache miss, and in-process hits come from FileCache
+    return yf.Ticker(symbol, session=yf_session)
+
+
+def get_info(ticker: str, force_refresh: bool = False) -> dict:
+    """Full `.info` payload: company metadata and fundamentals"""
+    symbol = _symbol(ticker)
+    return cache.get_or_set(symbol, "info", "", INFO_TTL, lambda: _stock(symbol).info, force_refresh)
+
+
+def get_history(ticker: str, period: str = "3mo", force_refresh: bool = False) -> pd.DataFrame:
+    """Daily OHLCV history for one ticker, split/dividend adjusted"""
+    symbol = _symbol(ticker)
+    # actions=False skips the dividends/splits columns nobody reads; prices stay
+    # adjusted so they match get_bulk_history and the volatility/beta maths
+    return cache.get_or_set(
+        symbol, "history", period, HISTORY_TTL,
+        lambda: _stock(symbol).history(period=period, actions=False, auto_adjust=True, prepost=False),
+        force_refresh
+    )
+
+
+def get_bulk_history(tickers: list[str], period: str = "3mo", force_refresh: bool = False) -> dict[str, pd.DataFrame]:
+    """Daily OHLCV history for many tickers, downloading only cache misses in batches.
+
+    Invalid symbols and symbols Yahoo returned no data for are left out of
+    the result.
+    """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))
+    symbols = [symbol for symbol in symbols if SYMBOL_PATTERN.fullmatch(symbol)]
+    histories = {}
+    missing = []
+    for symbol in symbols:
+        hist = None if force_refresh else cache.get(symbol, "history", period)
+        if hist is not None:
+            histories[symbol] = hist
+        else:
+            missing.append(symbol)
+
+    for start in range(0, len(missing), BULK_CHUNK_SIZE):
+        chunk = missing[start:start + BULK_CHUNK_SIZE]
+        try:
+            data = yf.download(chunk, period=period, group_by="ticker", auto_adjust=True, threads=True, progress=False, session=yf_session)
+        except Exception as e:
+            logger.warning("bulk history download failed for %s: %s", chunk, e)
+            continue
+
+        for symbol in chunk:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                hist = data[symbol]
+            else:
+                hist = data
+            hist = hist.dropna(how="all")
+            if hist.empty:
+                continue
+            cache.set(symbol, "history", period, hist, HISTORY_TTL)
+            histories[symbol] = hist
+
+    return histories
+
+
+def get_statement(ticker: str, statement_type: str, force_refresh: bool = False) -> pd.DataFrame:
+    """One of the STATEMENT_TYPES frames, e.g. `financials` or `quarterly_cashflow`"""
+    getter = STATEMENT_GETTERS.get(statement_type)
+    if getter is None:
+        raise ValueError(f"Invalid statement type: {statement_type}")
+    symbol = _symbol(ticker)
+    return cache.get_or_set(
+        symbol, statement_type, "", STATEMENT_TTL,
+        lambda: getter(_stock(symbol)),
+        force_refresh
+    )
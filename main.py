@@ -4,6 +4,7 @@ Financial AI Supervisor - LangGraph Node Workflow
 Client Profile → Portfolio Constructor → Stock Research → Portfolio Refiner → END
 """
 import asyncio
+import os
 from datetime import date
 from langgraph.graph import StateGraph, START, END
 
@@ -11,16 +12,58 @@ from langgraph.graph import StateGraph, START, END
 from app.agents.client_profile_agent import client_profile_node
 from app.agents.stock_research_agent import stock_research_node
 from app.agents.portfolio_constructor_agent import portfolio_construct_node, portfolio_refine_node
+from app.agents import client_profile_agent, portfolio_constructor_agent, stock_research_agent
 from app.models.client_profile import ClientProfile
+from app.tools.cache import CACHE_DIR, FileCache
 from typing import Annotated
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import AIMessageChunk, BaseMessage
+
+# orjson parses and re-indents the final report several times faster;
+# the stdlib json module is the fallback when it is not installed
+try:
+    import orjson
+
+    def pretty_json(text: str) -> str:
+        return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+
+    def pretty_json(text: str) -> str:
+        return json.dumps(json.loads(text), indent=2)
+
+# Final output of previous runs keyed on the client profile, so re-running
+# an unchanged profile skips the whole agent pipeline
+RUN_CACHE_TTL = float(os.getenv("BULLIE_RUN_CACHE_TTL", 24 * 60 * 60))
+# Bump when tools or graph wiring change; prompts and models are keyed below
+RUN_CACHE_VERSION = 1
+run_cache = FileCache(CACHE_DIR / "runs")
+
+def run_cache_key(client_profile_json: str) -> str:
+    """Run cache params: the profile plus every prompt and model that shapes the answer"""
+    agents = (
+        (client_profile_agent.SYSTEM_PROMPT, client_profile_agent.gpt_model.model_name),
+        (portfolio_constructor_agent.REFINE_PROMPT, portfolio_constructor_agent.llm.model_name),
+        (stock_research_agent.SYSTEM_PROMPT, stock_research_agent.llm.model_name)
+    )
+    return repr((RUN_CACHE_VERSION, client_profile_json, agents))
 
 class WorkflowState(TypedDict):
     """State schema for the LangGraph workflow"""
     messages: Annotated[list[BaseMessage], add_messages]
-    client_profile: ClientProfile
+    client_profile_json: str  # ClientProfile serialized once at graph entry
+
+def print_final_portfolio(portfolio_content: str):
+    """Pretty-print the final portfolio message, as JSON when it parses"""
+    print("📊 FINAL PORTFOLIO RECOMMENDATION")
+    
+    # Try to parse and pretty print as JSON
+    try:
+        print(pretty_json(portfolio_content))
+    except ValueError:
+        # If it's not valid JSON, just print as is
+        print(portfolio_content)
 
 async def main():
     
@@ -32,6 +75,14 @@ async def main():
         start_date=date(2024, 1, 1),
         end_date=date(2034, 1, 1)
     )
+    client_profile_json = client_profile.model_dump_json()
+    cache_key = run_cache_key(client_profile_json)
+    
+    portfolio_content = run_cache.get("workflow", "final_portfolio", cache_key)
+    if portfolio_content is not None:
+        print("📦 Using cached run for this client profile")
+        print_final_portfolio(portfolio_content)
+        return
     
     # Create StateGraph with WorkflowState as state
     workflow = StateGraph(WorkflowState)
@@ -53,27 +104,30 @@ async def main():
     
     # Create initial workflow state
     initial_state = {
-        "client_profile": client_profile,
+        "client_profile_json": client_profile_json,
         "messages": []
     }
     
-    # Run workflow with WorkflowState as initial state
-    result = await app.ainvoke(initial_state)
+    # Stream LLM tokens as the agents generate them, plus top-level node
+    # updates for progress; subgraphs=True surfaces the agent runs nested
+    # inside each node
+    messages = []
+    async for namespace, mode, chunk in app.astream(initial_state, stream_mode=["updates", "messages"], subgraphs=True):
+        if mode == "messages":
+            token, _metadata = chunk
+            if isinstance(token, AIMessageChunk) and isinstance(token.content, str):
+                print(token.content, end="", flush=True)
+        elif not namespace:
+            for node_name, node_update in chunk.items():
+                print(f"\n✅ {node_name} finished")
+                messages.extend((node_update or {}).get("messages", []))
     
     # Extract just the final portfolio from the last message
-    final_message = result['messages'][-1]  # Last message from portfolio_refine_agent
+    final_message = messages[-1]  # Last message from portfolio_refine_agent
     portfolio_content = final_message.content
+    run_cache.set("workflow", "final_portfolio", cache_key, portfolio_content, RUN_CACHE_TTL)
     
-    print("📊 FINAL PORTFOLIO RECOMMENDATION")
-    
-    # Try to parse and pretty print as JSON
-    import json
-    try:
-        portfolio_json = json.loads(portfolio_content)
-        print(json.dumps(portfolio_json, indent=2))
-    except json.JSONDecodeError:
-        # If it's not valid JSON, just print as is
-        print(portfolio_content)
+    print_final_portfolio(portfolio_content)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,7 +1,42 @@
 
 
 
+from langchain_core.messages import trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+
+# Upper bound on the conversation history handed to a node's agent, so its
+# prompt stays flat instead of growing with every node in the graph
+HISTORY_MAX_TOKENS = 4000
+
+
 def load_prompt(file_path):
     with open(file_path, "r") as file:
         return file.read()
-    
\ No newline at end of file
+
+
+def format_chat_history(messages, max_tokens=HISTORY_MAX_TOKENS):
+    """Render the most recent messages that fit in max_tokens as 'name: content' lines"""
+    recent = trim_messages(
+        messages,
+        strategy="last",
+        max_tokens=max_tokens,
+        token_counter=count_tokens_approximately
+    )
+    return "\n".join(f"{msg.name or 'user'}: {msg.content}" for msg in recent)
+
+
+async def astream_structured_response(agent, messages):
+    """Run an agent with astream and return its structured_response.
+
+    The response only exists after the agent's final step, so this returns no
+    sooner than ainvoke. Streaming inside a graph node lets the LLM tokens reach
+    the caller's app.astream(stream_mode="messages") while the agent runs.
+    """
+    stream = agent.astream({"messages": messages}, stream_mode="values")
+    try:
+        async for state in stream:
+            if state.get("structured_response") is not None:
+                return state["structured_response"]
+    finally:
+        await stream.aclose()
+    raise ValueError("Agent finished without a structured_response")